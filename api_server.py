@@ -0,0 +1,480 @@
+"""Finance Agent için başsız (headless) HTTP/JSON analiz servisi.
+
+Uç noktalar:
+    GET /health
+    GET /analysis?symbol=THYAO.IS&period=1y&report=1
+    GET /batch?symbols=THYAO.IS,BTC-USD&period=1y
+    GET /category?name=🪙 Kripto Paralar&limit=8
+
+Örnek:
+    python api_server.py --port 8080 --workers 16
+    python api_server.py --fake   # ağ bağlantısı olmadan yük testi
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from asset_catalog import get_symbols_by_category
+from finance_agent import advanced_analysis, get_demo_stock_data, get_stock_data
+from report_generator import generate_report
+
+logger = logging.getLogger("FinanceAgentAPI")
+
+ALLOWED_PERIODS = ("1mo", "3mo", "6mo", "1y", "2y")
+MAX_BATCH_SYMBOLS = 50
+GZIP_MIN_BYTES = 512
+FAILURE_TTL = 30.0
+MAX_CACHE_ENTRIES = 1024
+
+# Sahte veri kaynağı sabit bir bitiş tarihine bağlıdır; yanıtlar günden güne değişmez
+FAKE_END = pd.Timestamp("2024-12-31")
+
+# Sahte veri kaynağının periyot başına döndüreceği iş günü sayısı
+_FAKE_PERIOD_DAYS = {"1mo": 21, "3mo": 63, "6mo": 126, "1y": 252, "2y": 504}
+
+# ETag yalnızca veriden türeyen alanlarla hesaplanır (rapor saat içerir)
+_ETAG_FIELDS = ("symbol", "period", "is_demo", "as_of", "analysis", "error")
+
+Loader = Callable[[str, str], Tuple[Optional[pd.DataFrame], float, bool]]
+
+
+def yfinance_loader(symbol: str, period: str) -> Tuple[Optional[pd.DataFrame], float, bool]:
+    """Canlı veri; başarısızlıkta demo veriye düşmez, (None, 0.0, False) döner."""
+    return get_stock_data(symbol=symbol, period=period, allow_demo_fallback=False)
+
+
+def fake_loader(symbol: str, period: str) -> Tuple[Optional[pd.DataFrame], float, bool]:
+    """Sembole göre sabit tohumlu, periyot uzunluğunda sentetik veri döner (yük testi için)."""
+    seed = zlib.crc32(f"{symbol}|{period}".encode("utf-8"))
+    df, volatility = get_demo_stock_data(seed=seed, days=_FAKE_PERIOD_DAYS.get(period, 252), end=FAKE_END)
+    return df, volatility, True
+
+
+@dataclass(frozen=True)
+class EncodedBody:
+    identity: bytes
+    gzipped: Optional[bytes]
+
+
+def _encode_body(body: object) -> EncodedBody:
+    """Gövdeyi bir kez JSON'a çevirir; yeterince büyükse gzip halini de hazırlar."""
+    data = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+    return EncodedBody(data, gzip.compress(data, compresslevel=5) if len(data) >= GZIP_MIN_BYTES else None)
+
+
+@dataclass
+class CacheEntry:
+    payload: Dict[str, object]
+    etag: str
+    created_at: float
+    ttl: float
+    _bodies: Dict[bool, EncodedBody] = field(default_factory=dict, repr=False, compare=False)
+
+    @property
+    def failed(self) -> bool:
+        return "error" in self.payload
+
+    @property
+    def version(self) -> Tuple[str, float]:
+        return self.etag, self.created_at
+
+    def body(self, include_report: bool) -> EncodedBody:
+        """Girdi TTL boyunca değişmediğinden kodlanmış gövde temsil başına bir kez üretilir."""
+        encoded = self._bodies.get(include_report)
+        if encoded is None:
+            encoded = self._bodies[include_report] = _encode_body(_public_payload(self, include_report))
+        return encoded
+
+
+class AnalysisCache:
+    """İş parçacıkları arasında paylaşılan, TTL'li ve boyutu sınırlı (LRU) sıcak önbellek.
+
+    Aynı anahtar için eşzamanlı istekler tek bir veri çekimini bekler;
+    böylece soğuk bir sembol için yfinance yalnızca bir kez çağrılır.
+    Veri alınamayan semboller yalnızca FAILURE_TTL kadar tutulur.
+    """
+
+    def __init__(self, loader: Loader, ttl: float = 300.0, max_entries: int = MAX_CACHE_ENTRIES):
+        self.loader = loader
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], CacheEntry]" = OrderedDict()
+        self._key_locks: Dict[Tuple[str, str], List] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _acquire_key(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._lock:
+            slot = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            slot[1] += 1
+        slot[0].acquire()
+        return slot[0]
+
+    def _release_key(self, key: Tuple[str, str], lock: threading.Lock) -> None:
+        lock.release()
+        with self._lock:
+            slot = self._key_locks[key]
+            slot[1] -= 1
+            if slot[1] == 0:
+                del self._key_locks[key]
+
+    @staticmethod
+    def _expired(entry: CacheEntry, now: float) -> bool:
+        return now - entry.created_at >= entry.ttl
+
+    def _fresh(self, key: Tuple[str, str]) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry, time.time()):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key: Tuple[str, str], entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                now = time.time()
+                for stale in [k for k, e in self._entries.items() if self._expired(e, now)]:
+                    del self._entries[stale]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, symbol: str, period: str) -> CacheEntry:
+        key = (symbol, period)
+        entry = self._fresh(key)
+        if entry is not None:
+            return entry
+
+        lock = self._acquire_key(key)
+        try:
+            entry = self._fresh(key)
+            if entry is None:
+                entry = self._build(symbol, period)
+                self._store(key, entry)
+            return entry
+        finally:
+            self._release_key(key, lock)
+
+    def max_age(self, entry: CacheEntry) -> int:
+        return max(0, int(entry.ttl - (time.time() - entry.created_at)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _build(self, symbol: str, period: str) -> CacheEntry:
+        df, volatility, is_demo = self.loader(symbol, period)
+        if df is None or df.empty:
+            payload: Dict[str, object] = {
+                "symbol": symbol,
+                "period": period,
+                "error": f"'{symbol}' için veri bulunamadı.",
+            }
+            return CacheEntry(payload, _etag(payload), time.time(), min(self.ttl, FAILURE_TTL))
+
+        analysis = advanced_analysis(df, volatility)
+        payload = {
+            "symbol": symbol,
+            "period": period,
+            "is_demo": is_demo,
+            "as_of": df.index[-1].strftime("%Y-%m-%d"),
+            "analysis": analysis,
+            "report": generate_report(symbol, analysis),
+        }
+        data = {k: payload[k] for k in _ETAG_FIELDS if k in payload}
+        return CacheEntry(payload, _etag(data), time.time(), self.ttl)
+
+
+def _etag(payload: object) -> str:
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return '"' + hashlib.sha1(raw).hexdigest() + '"'
+
+
+def _representation_etag(entries: List[CacheEntry], include_report: bool, encoding: Optional[str]) -> str:
+    """Varlık ETag'lerini rapor seçeneği ve içerik kodlamasıyla birleştirir."""
+    tag = _etag([[e.etag for e in entries], include_report])
+    return tag[:-1] + f"-{encoding}" + '"' if encoding else tag
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Accept-Encoding başlığını q değerleriyle okur; 'gzip;q=0' reddi ifade eder."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in weights:
+            return weights[coding] > 0
+    return False
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match için zayıf karşılaştırma; '*' mevcut her kaynakla eşleşir."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [t.strip() for t in if_none_match.split(",")]
+    return any((t[2:] if t.startswith("W/") else t) == etag for t in candidates)
+
+
+def _public_payload(entry: CacheEntry, include_report: bool) -> Dict[str, object]:
+    if include_report:
+        return entry.payload
+    return {k: v for k, v in entry.payload.items() if k != "report"}
+
+
+class AnalysisService:
+    def __init__(self, cache: AnalysisCache, fetch_workers: int = 8):
+        self.cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="fetch")
+        self._bodies: "OrderedDict[tuple, EncodedBody]" = OrderedDict()
+        self._bodies_lock = threading.Lock()
+
+    def single(self, symbol: str, period: str) -> List[CacheEntry]:
+        return [self.cache.get(symbol, period)]
+
+    def batch(self, symbols: List[str], period: str) -> List[CacheEntry]:
+        return list(self._pool.map(lambda s: self.cache.get(s, period), symbols))
+
+    def composite_body(self, key: tuple, entries: List[CacheEntry], build: Callable[[], object]) -> EncodedBody:
+        """Toplu yanıt gövdelerini girdi sürümlerine göre LRU'da tutar."""
+        key = key + tuple(e.version for e in entries)
+        with self._bodies_lock:
+            encoded = self._bodies.get(key)
+            if encoded is not None:
+                self._bodies.move_to_end(key)
+                return encoded
+        encoded = _encode_body(build())
+        with self._bodies_lock:
+            self._bodies[key] = encoded
+            while len(self._bodies) > self.cache.max_entries:
+                self._bodies.popitem(last=False)
+        return encoded
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False)
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _param(query: Dict[str, List[str]], name: str, default: Optional[str] = None) -> Optional[str]:
+    values = query.get(name)
+    if not values or not values[0].strip():
+        return default
+    return values[0].strip()
+
+
+def _period(query: Dict[str, List[str]]) -> str:
+    period = _param(query, "period", "1y")
+    if period not in ALLOWED_PERIODS:
+        raise ApiError(400, f"Geçersiz periyot: {period}. İzin verilenler: {', '.join(ALLOWED_PERIODS)}")
+    return period
+
+
+def _flag(query: Dict[str, List[str]], name: str) -> bool:
+    return (_param(query, name, "0") or "0").lower() in ("1", "true", "yes")
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    server_version = "FinanceAgentAPI/1.0"
+    protocol_version = "HTTP/1.1"
+    service: AnalysisService  # make_server tarafından atanır
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        try:
+            if url.path == "/health":
+                self._send_json(200, {"status": "ok"}, cache_control="no-store")
+                return
+            include_report = _flag(query, "report")
+            entries, body = self._route(url.path, query, include_report)
+        except ApiError as exc:
+            self._send_json(exc.status, {"error": exc.message}, cache_control="no-store")
+            return
+        except Exception as exc:
+            logger.exception("⚠️ İstek işlenemedi: %s", self.path)
+            self._send_json(500, {"error": str(exc)}, cache_control="no-store")
+            return
+
+        data, encoding = self._select(body)
+        etag = _representation_etag(entries, include_report, encoding)
+        max_age = min((self.service.cache.max_age(e) for e in entries), default=0)
+        cache_control = f"public, max-age={max_age}"
+
+        if _etag_matches(self.headers.get("If-None-Match", ""), etag):
+            self.send_response(304)
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", cache_control)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self._send(200, data, encoding, etag=etag, cache_control=cache_control)
+
+    def _route(
+        self, path: str, query: Dict[str, List[str]], include_report: bool
+    ) -> Tuple[List[CacheEntry], EncodedBody]:
+        period = _period(query)
+
+        if path == "/analysis":
+            symbol = _param(query, "symbol")
+            if not symbol:
+                raise ApiError(400, "'symbol' parametresi gerekli.")
+            entries = self.service.single(symbol.upper(), period)
+            if entries[0].failed:
+                raise ApiError(404, str(entries[0].payload["error"]))
+            return entries, entries[0].body(include_report)
+
+        if path == "/batch":
+            raw = _param(query, "symbols", "") or ""
+            symbols = list(dict.fromkeys(s.strip().upper() for s in raw.split(",") if s.strip()))
+            if not symbols:
+                raise ApiError(400, "'symbols' parametresi gerekli (virgülle ayrılmış).")
+            if len(symbols) > MAX_BATCH_SYMBOLS:
+                raise ApiError(400, f"En fazla {MAX_BATCH_SYMBOLS} sembol istenebilir.")
+            entries = self.service.batch(symbols, period)
+            body = self.service.composite_body(
+                ("batch", tuple(symbols), period, include_report),
+                entries,
+                lambda: {"results": [_public_payload(e, include_report) for e in entries]},
+            )
+            return entries, body
+
+        if path == "/category":
+            name = _param(query, "name")
+            items = get_symbols_by_category(name) if name else []
+            if not items:
+                raise ApiError(404, f"Kategori bulunamadı: {name}")
+            limit = _param(query, "limit")
+            if limit is not None:
+                if not limit.isdigit() or int(limit) < 1:
+                    raise ApiError(400, "'limit' pozitif bir tam sayı olmalı.")
+                items = items[: int(limit)]
+            entries = self.service.batch([item.symbol for item in items], period)
+
+            def build() -> object:
+                results = []
+                for item, entry in zip(items, entries):
+                    payload = dict(_public_payload(entry, include_report))
+                    payload["label"] = item.label
+                    results.append(payload)
+                return {"category": name, "results": results}
+
+            body = self.service.composite_body(
+                ("category", name, tuple(item.symbol for item in items), period, include_report), entries, build
+            )
+            return entries, body
+
+        raise ApiError(404, f"Bilinmeyen uç nokta: {path}")
+
+    def _select(self, body: EncodedBody) -> Tuple[bytes, Optional[str]]:
+        if body.gzipped is not None and _accepts_gzip(self.headers.get("Accept-Encoding", "")):
+            return body.gzipped, "gzip"
+        return body.identity, None
+
+    def _send_json(self, status: int, body: object, cache_control: Optional[str] = None) -> None:
+        data, encoding = self._select(_encode_body(body))
+        self._send(status, data, encoding, cache_control=cache_control)
+
+    def _send(
+        self,
+        status: int,
+        data: bytes,
+        encoding: Optional[str],
+        etag: Optional[str] = None,
+        cache_control: Optional[str] = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if etag:
+            self.send_header("ETag", etag)
+        if cache_control:
+            self.send_header("Cache-Control", cache_control)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def make_server(
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    loader: Loader = yfinance_loader,
+    ttl: float = 300.0,
+    fetch_workers: int = 8,
+) -> ThreadingHTTPServer:
+    """İstek başına bir iş parçacığı açan, önbelleği paylaşan sunucuyu kurar."""
+    service = AnalysisService(AnalysisCache(loader, ttl=ttl), fetch_workers=fetch_workers)
+    handler = type("BoundAnalysisRequestHandler", (AnalysisRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Finance Agent HTTP/JSON analiz servisi")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--ttl", type=float, default=300.0, help="Önbellek tazelik süresi (saniye)")
+    parser.add_argument("--workers", type=int, default=8, help="Toplu istekler için eşzamanlı veri çekici sayısı")
+    parser.add_argument("--fake", action="store_true", help="yfinance yerine sentetik veri kullan")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    loader = fake_loader if args.fake else yfinance_loader
+    server = make_server(args.host, args.port, loader=loader, ttl=args.ttl, fetch_workers=args.workers)
+    logger.info("🌐 Servis %s:%s adresinde dinliyor (fake=%s)", args.host, args.port, args.fake)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.RequestHandlerClass.service.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
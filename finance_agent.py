@@ -28,10 +28,11 @@ def _safe_float(value: Optional[float], default: float = 0.0) -> float:
     return float(value)
 
 
-def create_mock_data(days: int = 260, seed: int = 42) -> pd.DataFrame:
+def create_mock_data(days: int = 260, seed: int = 42, end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
     """Dış veri bağlantısı yoksa demo amaçlı sentetik OHLC veri üretir."""
     rng = np.random.default_rng(seed)
-    idx = pd.date_range(end=pd.Timestamp.today().normalize(), periods=days, freq="B")
+    end = pd.Timestamp.today().normalize() if end is None else pd.Timestamp(end).normalize()
+    idx = pd.date_range(end=end, periods=days, freq="B")
     base = np.cumsum(rng.normal(0.15, 1.8, size=days)) + 100
     close = np.maximum(base, 5)
     open_ = close + rng.normal(0, 0.9, size=days)
@@ -51,7 +52,17 @@ def create_mock_data(days: int = 260, seed: int = 42) -> pd.DataFrame:
     )
 
 
-def _add_indicators(df: pd.DataFrame, config: AnalysisConfig) -> Tuple[pd.DataFrame, float]:
+def get_demo_stock_data(
+    seed: int = 42,
+    days: int = 260,
+    config: AnalysisConfig = AnalysisConfig(),
+    end: Optional[pd.Timestamp] = None,
+) -> Tuple[pd.DataFrame, float]:
+    """Sentetik veriyi üretip göstergeleri ekler (ağ bağlantısı gerektirmez)."""
+    return add_indicators(create_mock_data(days=days, seed=seed, end=end), config)
+
+
+def add_indicators(df: pd.DataFrame, config: AnalysisConfig) -> Tuple[pd.DataFrame, float]:
     df = df.dropna(subset=["Open", "High", "Low", "Close"]).copy()
 
     # Ortalamalar
@@ -106,15 +117,14 @@ def get_stock_data(
         if df.empty:
             raise ValueError(f"'{symbol}' için veri bulunamadı.")
 
-        df, volatility = _add_indicators(df, config)
+        df, volatility = add_indicators(df, config)
         return df, volatility, False
 
     except Exception as exc:
         logger.error("❌ Veri çekme hatası: %s", exc)
         if allow_demo_fallback:
             logger.warning("🧪 Demo veri moduna geçiliyor.")
-            demo_df = create_mock_data()
-            demo_df, volatility = _add_indicators(demo_df, config)
+            demo_df, volatility = get_demo_stock_data(config=config)
             return demo_df, volatility, True
         return None, 0.0, False
 
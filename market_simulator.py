@@ -0,0 +1,452 @@
+"""Ağ bağlantısı gerektirmeyen korelasyonlu piyasa simülatörü ve replay modu.
+
+Örnek:
+    python market_simulator.py --extra 40 --bench
+    python market_simulator.py --replay --speed 864000 --steps 60
+    python market_simulator.py --save panel.pkl
+"""
+import argparse
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from asset_catalog import ASSET_CATEGORIES
+from finance_agent import AnalysisConfig, add_indicators, advanced_analysis
+from report_generator import generate_report
+
+logger = logging.getLogger("MarketSimulator")
+
+StockData = Tuple[Optional[pd.DataFrame], float, bool]
+
+DEFAULT_END = pd.Timestamp("2024-12-31")
+
+# Ay/gün olarak sabit tatiller; dini bayramlar gibi hareketli tatiller simüle edilmez.
+_CALENDAR_HOLIDAYS: Dict[str, List[Tuple[int, int]]] = {
+    "bist": [(1, 1), (4, 23), (5, 1), (5, 19), (7, 15), (8, 30), (10, 29)],
+    "us": [(1, 1), (7, 4), (12, 25)],
+    "fx": [(1, 1), (12, 25)],
+    "crypto": [],
+}
+
+_PERIOD_OFFSETS: Dict[str, pd.DateOffset] = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+}
+
+
+@dataclass(frozen=True)
+class AssetClassProfile:
+    calendar: str
+    annual_vol: float
+    annual_drift: float
+    market_beta: float
+    sector_weight: float
+    jumps_per_year: float
+    jump_scale: float
+    base_price: float
+    base_volume: float
+
+
+@dataclass(frozen=True)
+class Regime:
+    name: str
+    vol_mult: float
+    drift_shift: float
+    corr_mult: float
+    persistence: float
+
+
+DEFAULT_PROFILE = AssetClassProfile("us", 0.28, 0.08, 0.6, 0.4, 3.0, 0.03, 100.0, 2_000_000)
+
+ASSET_CLASS_PROFILES: Dict[str, AssetClassProfile] = {
+    "🇹🇷 BIST Hisseleri": AssetClassProfile("bist", 0.38, 0.25, 0.55, 0.55, 5.0, 0.04, 60.0, 8_000_000),
+    "🌍 Global Endeksler": AssetClassProfile("us", 0.18, 0.07, 0.8, 0.3, 1.5, 0.02, 5_000.0, 3_000_000),
+    "📊 ETF'ler": AssetClassProfile("us", 0.20, 0.07, 0.75, 0.35, 1.5, 0.02, 250.0, 40_000_000),
+    "🪙 Kripto Paralar": AssetClassProfile("crypto", 0.70, 0.30, 0.35, 0.75, 8.0, 0.06, 500.0, 1_000_000_000),
+    "💱 Döviz Pariteleri": AssetClassProfile("fx", 0.09, 0.0, 0.2, 0.5, 1.0, 0.01, 1.5, 0),
+    "⛏️ Emtialar & Vadeli": AssetClassProfile("us", 0.30, 0.03, 0.3, 0.6, 3.0, 0.03, 80.0, 300_000),
+    "🏦 Fonlar / Mutual Funds": AssetClassProfile("us", 0.16, 0.07, 0.85, 0.3, 0.5, 0.015, 150.0, 0),
+}
+
+DEFAULT_REGIMES: Tuple[Regime, ...] = (
+    Regime("Sakin", vol_mult=0.8, drift_shift=0.05, corr_mult=1.0, persistence=0.99),
+    Regime("Stres", vol_mult=2.2, drift_shift=-0.35, corr_mult=1.5, persistence=0.96),
+)
+
+
+# Sembol son ekine göre takvim; eşleşmezse kategori profilinin takvimi kullanılır.
+_SYMBOL_CALENDARS: Tuple[Tuple[str, str], ...] = ((".IS", "bist"), ("-USD", "crypto"), ("=X", "fx"))
+
+
+def calendar_for(symbol: str, profile: AssetClassProfile = DEFAULT_PROFILE) -> str:
+    for suffix, calendar in _SYMBOL_CALENDARS:
+        if symbol.endswith(suffix):
+            return calendar
+    return profile.calendar
+
+
+def _profile_for(category: str) -> AssetClassProfile:
+    profile = ASSET_CLASS_PROFILES.get(category)
+    if profile is None:
+        if category:
+            logger.warning("⚠️ '%s' kategorisi için profil yok, varsayılan profil kullanılıyor.", category)
+        return DEFAULT_PROFILE
+    return profile
+
+
+def trading_calendar(name: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DatetimeIndex:
+    """Varlık sınıfının işlem günlerini döner (kripto 7/24, diğerleri iş günü - tatil)."""
+    if name == "crypto":
+        return pd.date_range(start, end, freq="D")
+    days = pd.date_range(start, end, freq="B")
+    codes = [m * 100 + d for m, d in _CALENDAR_HOLIDAYS.get(name, [])]
+    return days[~np.isin(days.month * 100 + days.day, codes)]
+
+
+@dataclass
+class MarketPanel:
+    bars: Dict[str, pd.DataFrame]
+    categories: Dict[str, str]
+    regimes: pd.Series
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.bars.keys())
+
+    def save(self, path: str) -> None:
+        pd.to_pickle({"bars": self.bars, "categories": self.categories, "regimes": self.regimes}, path)
+
+    @classmethod
+    def load(cls, path: str) -> "MarketPanel":
+        raw = pd.read_pickle(path)
+        return cls(bars=raw["bars"], categories=raw["categories"], regimes=raw["regimes"])
+
+
+def _universe(extra_per_category: int) -> List[Tuple[str, str]]:
+    universe = []
+    for ci, (category, items) in enumerate(ASSET_CATEGORIES.items()):
+        universe.extend((item.symbol, category) for item in items)
+        universe.extend((f"SIM{ci}-{i:04d}", category) for i in range(extra_per_category))
+    return universe
+
+
+def _regime_path(rng: np.random.Generator, n: int, regimes: Sequence[Regime]) -> np.ndarray:
+    draws = rng.random(n)
+    if len(regimes) == 1:
+        return np.zeros(n, dtype=int)
+    switch_to = rng.integers(0, len(regimes) - 1, size=n)
+    path = np.empty(n, dtype=int)
+    state = 0
+    for t in range(n):
+        if draws[t] > regimes[state].persistence:
+            state = switch_to[t] + (switch_to[t] >= state)
+        path[t] = state
+    return path
+
+
+def simulate_market(
+    symbols: Optional[Sequence[str]] = None,
+    days: int = 730,
+    end: pd.Timestamp = DEFAULT_END,
+    seed: int = 7,
+    extra_per_category: int = 0,
+    regimes: Sequence[Regime] = DEFAULT_REGIMES,
+    intraday_share: float = 0.7,
+    off_day_variance: float = 0.1,
+) -> MarketPanel:
+    """Korelasyonlu, rejim değişimli ve boşluklu çok varlıklı OHLCV paneli üretir.
+
+    Getiriler piyasa + kategori + varlığa özgü faktörlerden oluşur ve `days`
+    takvim günü boyunca tek seferde vektörel olarak hesaplanır; her varlık
+    daha sonra kendi işlem takvimine göre örneklenir. Kapanışa kadar biriken
+    gece/tatil getirileri ve rastgele sıçramalar açılış boşluklarını oluşturur.
+    """
+    if days < 1:
+        raise ValueError(f"'days' en az 1 olmalı: {days}")
+    if not regimes:
+        raise ValueError("En az bir rejim tanımlanmalı.")
+
+    universe = _universe(extra_per_category)
+    if symbols is not None:
+        known = dict(universe)
+        universe = [(s, known.get(s, "")) for s in symbols]
+    if not universe:
+        raise ValueError("Simülasyon için en az bir sembol gerekli.")
+
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end).normalize()
+    grid = pd.date_range(end=end, periods=days, freq="D")
+
+    cat_names = sorted({c for _, c in universe})
+    cat_idx = np.array([cat_names.index(c) for _, c in universe])
+    profile_by_category = {c: _profile_for(c) for c in cat_names}
+    profiles = [profile_by_category[c] for _, c in universe]
+    asset_calendars = [calendar_for(symbol, profile) for (symbol, _), profile in zip(universe, profiles)]
+    n_assets = len(universe)
+
+    def col(attr: str) -> np.ndarray:
+        return np.array([getattr(p, attr) for p in profiles], dtype=float)
+
+    calendars = {name: trading_calendar(name, grid[0], grid[-1]) for name in set(asset_calendars)}
+    trading = np.column_stack([grid.isin(calendars[name]) for name in asset_calendars])
+    per_year = np.array([365.0 if name == "crypto" else 252.0 for name in asset_calendars])
+    sigma = col("annual_vol") / np.sqrt(per_year)
+
+    regime_path = _regime_path(rng, days, regimes)
+    vol_mult = np.array([r.vol_mult for r in regimes])[regime_path][:, None]
+    drift_shift = np.array([r.drift_shift for r in regimes])[regime_path][:, None]
+    corr_mult = np.array([r.corr_mult for r in regimes])[regime_path][:, None]
+
+    beta = np.clip(col("market_beta") * corr_mult, 0.0, 0.97)
+    sector = col("sector_weight")
+    idio = np.sqrt(np.clip(1.0 - beta**2 - sector**2, 0.05, None))
+    shocks = (
+        beta * rng.standard_normal((days, 1))
+        + sector * rng.standard_normal((days, len(cat_names)))[:, cat_idx]
+        + idio * rng.standard_normal((days, n_assets))
+    ) / np.sqrt(beta**2 + sector**2 + idio**2)
+
+    day_var = np.where(trading, 1.0, off_day_variance)
+    drift = np.where(trading, (col("annual_drift") + drift_shift) / per_year, 0.0)
+    diffusion = sigma * vol_mult * np.sqrt(day_var) * shocks
+    intraday = np.where(trading, intraday_share * diffusion, 0.0)
+
+    jump_hits = trading & (rng.random((days, n_assets)) < col("jumps_per_year") / per_year)
+    jumps = np.where(jump_hits, rng.normal(0.0, 1.0, (days, n_assets)) * col("jump_scale"), 0.0)
+
+    base = col("base_price") * np.exp(rng.normal(0.0, 0.5, n_assets))
+    log_close = np.log(base) + np.cumsum(drift + diffusion + jumps, axis=0)
+    close = np.exp(log_close)
+    open_ = np.exp(log_close - intraday)
+    wick = sigma * vol_mult * 0.5
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0.0, 1.0, (days, n_assets))) * wick)
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0.0, 1.0, (days, n_assets))) * wick)
+    activity = 1.0 + 0.3 * np.abs(diffusion + jumps) / sigma
+    volume = (col("base_volume") * np.sqrt(vol_mult) * activity * np.exp(rng.normal(0.0, 0.35, (days, n_assets))))
+
+    bars: Dict[str, pd.DataFrame] = {}
+    for j, (symbol, _) in enumerate(universe):
+        rows = trading[:, j]
+        bars[symbol] = pd.DataFrame(
+            {
+                "Open": open_[rows, j],
+                "High": high[rows, j],
+                "Low": low[rows, j],
+                "Close": close[rows, j],
+                "Volume": volume[rows, j].astype(np.int64),
+            },
+            index=grid[rows],
+        )
+
+    regime_series = pd.Series([regimes[i].name for i in regime_path], index=grid, name="regime")
+    return MarketPanel(bars=bars, categories=dict(universe), regimes=regime_series)
+
+
+def _window(df: pd.DataFrame, period: str, until: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    idx = df.index
+    stop = len(idx) if until is None else idx.searchsorted(until, side="right")
+    if stop == 0:
+        return df.iloc[0:0]
+    start = idx.searchsorted(idx[stop - 1] - _PERIOD_OFFSETS.get(period, _PERIOD_OFFSETS["1y"]), side="left")
+    return df.iloc[start:stop]
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    return float(np.percentile(values, q)) if len(values) else 0.0
+
+
+@dataclass
+class LatencyStats:
+    samples: List[float] = field(default_factory=list)
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def summary(self) -> Dict[str, float]:
+        total = float(sum(self.samples))
+        return {
+            "count": len(self.samples),
+            "p50_ms": _percentile(self.samples, 50) * 1000,
+            "p95_ms": _percentile(self.samples, 95) * 1000,
+            "max_ms": max(self.samples, default=0.0) * 1000,
+            "total_s": total,
+        }
+
+
+class MarketReplay:
+    """Kayıtlı veya simüle edilmiş barları hızlandırılmış duvar saatiyle oynatır.
+
+    `speed`, duvar saatinde bir saniyeye karşılık gelen simülasyon saniyesidir
+    (86400 → saniyede bir gün); None ise beklemeden olabildiğince hızlı oynatır.
+    `loader` get_stock_data ile aynı (df, volatilite, is_demo) çıktısını verir,
+    böylece api_server veya get_stock_data tüketicilerine doğrudan bağlanabilir.
+    api_server ile kullanırken `make_server(loader=replay.loader, ttl=0)` verilmelidir;
+    aksi halde önbellek ilk pencereyi TTL boyunca tutar ve ilerleyen barlar görünmez.
+    """
+
+    def __init__(
+        self,
+        panel: MarketPanel,
+        speed: Optional[float] = 86_400.0,
+        config: AnalysisConfig = AnalysisConfig(),
+        warmup: int = 60,
+    ):
+        self.panel = panel
+        self.speed = speed
+        self.config = config
+        self._cursor: Optional[pd.Timestamp] = None
+        self._lock = threading.Lock()
+
+        timeline: Dict[pd.Timestamp, List[str]] = {}
+        for symbol, df in panel.bars.items():
+            for ts in df.index[warmup:]:
+                timeline.setdefault(ts, []).append(symbol)
+        self.timeline: List[Tuple[pd.Timestamp, List[str]]] = sorted(timeline.items())
+
+    @property
+    def cursor(self) -> Optional[pd.Timestamp]:
+        with self._lock:
+            return self._cursor
+
+    def loader(self, symbol: str, period: str = "1y") -> StockData:
+        df = self.panel.bars.get(symbol)
+        if df is None:
+            return None, 0.0, False
+        window = _window(df, period, self.cursor)
+        if window.empty:
+            return None, 0.0, False
+        window, volatility = add_indicators(window, self.config)
+        return window, volatility, True
+
+    def run(
+        self,
+        consumer: Callable[[str, StockData], None],
+        period: str = "1y",
+        max_steps: Optional[int] = None,
+    ) -> Dict[str, float]:
+        """Zaman çizelgesini adım adım ilerletir ve her yeni bar için tüketiciyi çağırır."""
+        steps = self.timeline[:max_steps] if max_steps is not None else self.timeline
+        latency = LatencyStats()
+        max_lag = 0.0
+        wall_start = time.perf_counter()
+        sim_start = steps[0][0] if steps else None
+
+        for ts, symbols in steps:
+            if self.speed:
+                target = wall_start + (ts - sim_start).total_seconds() / self.speed
+                delay = target - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    max_lag = max(max_lag, -delay)
+            with self._lock:
+                self._cursor = ts
+            for symbol in symbols:
+                t0 = time.perf_counter()
+                consumer(symbol, self.loader(symbol, period))
+                latency.add(time.perf_counter() - t0)
+
+        elapsed = time.perf_counter() - wall_start
+        stats = latency.summary()
+        stats.update(
+            {
+                "steps": len(steps),
+                "elapsed_s": elapsed,
+                "bars_per_s": stats["count"] / elapsed if elapsed else 0.0,
+                "max_lag_ms": max_lag * 1000,
+            }
+        )
+        return stats
+
+
+def analysis_consumer(symbol: str, result: StockData) -> None:
+    """Replay için varsayılan tüketici: analiz + rapor (main.py akışı, dosyaya yazmadan)."""
+    df, vol, _ = result
+    generate_report(symbol, advanced_analysis(df, vol))
+
+
+def benchmark_pipeline(
+    panel: MarketPanel,
+    period: str = "1y",
+    repeat: int = 1,
+    config: AnalysisConfig = AnalysisConfig(),
+) -> Dict[str, Dict[str, float]]:
+    """veri → göstergeler → analiz → rapor akışının aşama bazında gecikmesini ölçer."""
+    stages = {name: LatencyStats() for name in ("fetch", "indicators", "analysis", "report", "total")}
+    wall_start = time.perf_counter()
+
+    for _ in range(repeat):
+        for symbol, df in panel.bars.items():
+            t0 = time.perf_counter()
+            window = _window(df, period)
+            t1 = time.perf_counter()
+            window, vol = add_indicators(window, config)
+            t2 = time.perf_counter()
+            analysis = advanced_analysis(window, vol)
+            t3 = time.perf_counter()
+            generate_report(symbol, analysis)
+            t4 = time.perf_counter()
+
+            stages["fetch"].add(t1 - t0)
+            stages["indicators"].add(t2 - t1)
+            stages["analysis"].add(t3 - t2)
+            stages["report"].add(t4 - t3)
+            stages["total"].add(t4 - t0)
+
+    elapsed = time.perf_counter() - wall_start
+    result = {name: stats.summary() for name, stats in stages.items()}
+    result["total"]["symbols_per_s"] = result["total"]["count"] / elapsed if elapsed else 0.0
+    return result
+
+
+def _print_stats(title: str, stats: Dict[str, float]) -> None:
+    print(f"{title}: " + ", ".join(f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}" for k, v in stats.items()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Finance Agent piyasa simülatörü ve replay aracı")
+    parser.add_argument("--days", type=int, default=730, help="Simüle edilecek takvim günü sayısı")
+    parser.add_argument("--extra", type=int, default=0, help="Kategori başına eklenecek sentetik sembol")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--load", help="Kayıtlı paneli (pickle) yükle")
+    parser.add_argument("--save", help="Üretilen paneli (pickle) kaydet")
+    parser.add_argument("--period", default="1y", choices=list(_PERIOD_OFFSETS))
+    parser.add_argument("--bench", action="store_true", help="Aşama bazlı akış ölçümü yap")
+    parser.add_argument("--replay", action="store_true", help="Replay modunda analiz akışını çalıştır")
+    parser.add_argument("--speed", type=float, default=0.0, help="Simülasyon sn / duvar sn (0: beklemesiz)")
+    parser.add_argument("--steps", type=int, default=None, help="Replay adım sınırı")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    t0 = time.perf_counter()
+    if args.load:
+        panel = MarketPanel.load(args.load)
+    else:
+        panel = simulate_market(days=args.days, seed=args.seed, extra_per_category=args.extra)
+    bar_count = sum(len(df) for df in panel.bars.values())
+    logger.info("🧪 %d varlık, %d bar hazır (%.2f sn)", len(panel.bars), bar_count, time.perf_counter() - t0)
+
+    if args.save:
+        panel.save(args.save)
+        logger.info("💾 Panel kaydedildi: %s", args.save)
+
+    if args.bench:
+        for stage, stats in benchmark_pipeline(panel, period=args.period).items():
+            _print_stats(stage, stats)
+
+    if args.replay:
+        replay = MarketReplay(panel, speed=args.speed or None)
+        _print_stats("replay", replay.run(analysis_consumer, period=args.period, max_steps=args.steps))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import gzip
+import http.client
+import json
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import quote
+
+import pytest
+
+import api_server
+from api_server import AnalysisCache, _accepts_gzip, fake_loader, make_server
+
+
+@contextmanager
+def _serve(loader):
+    srv = make_server(port=0, loader=loader)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        yield srv
+    finally:
+        srv.shutdown()
+        srv.RequestHandlerClass.service.shutdown()
+        srv.server_close()
+
+
+@pytest.fixture
+def server():
+    with _serve(fake_loader) as srv:
+        yield srv
+
+
+def _get(srv, path, headers=None):
+    conn = http.client.HTTPConnection(*srv.server_address, timeout=10)
+    try:
+        conn.request("GET", path, headers=headers or {})
+        resp = conn.getresponse()
+        return resp.status, dict(resp.getheaders()), resp.read()
+    finally:
+        conn.close()
+
+
+def test_analysis_returns_etag_and_304_on_match(server):
+    status, headers, body = _get(server, "/analysis?symbol=thyao.is")
+    assert status == 200
+    assert json.loads(body)["symbol"] == "THYAO.IS"
+    assert headers["Cache-Control"].startswith("public, max-age=")
+
+    for if_none_match in (headers["ETag"], "W/" + headers["ETag"], '"other", ' + headers["ETag"], "*"):
+        status, not_modified, body = _get(server, "/analysis?symbol=THYAO.IS", {"If-None-Match": if_none_match})
+        assert status == 304
+        assert body == b""
+        assert not_modified["ETag"] == headers["ETag"]
+        assert not_modified["Vary"] == "Accept-Encoding"
+
+    status, _, _ = _get(server, "/analysis?symbol=THYAO.IS", {"If-None-Match": 'W/"other"'})
+    assert status == 200
+
+
+def test_etag_differs_per_representation(server):
+    _, plain, _ = _get(server, "/analysis?symbol=THYAO.IS")
+    _, with_report, _ = _get(server, "/analysis?symbol=THYAO.IS&report=1")
+    assert plain["ETag"] != with_report["ETag"]
+
+    status, _, _ = _get(server, "/analysis?symbol=THYAO.IS&report=1", {"If-None-Match": plain["ETag"]})
+    assert status == 200
+
+
+def test_gzip_negotiation(server):
+    path = "/batch?symbols=THYAO.IS,BTC-USD,SPY"
+    _, identity_headers, identity_body = _get(server, path)
+    status, headers, body = _get(server, path, {"Accept-Encoding": "gzip"})
+
+    assert status == 200
+    assert "Content-Encoding" not in identity_headers
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["Vary"] == "Accept-Encoding"
+    assert json.loads(gzip.decompress(body)) == json.loads(identity_body)
+    assert headers["ETag"] != identity_headers["ETag"]
+
+
+    status, refused_headers, refused_body = _get(server, path, {"Accept-Encoding": "gzip;q=0, identity"})
+    assert status == 200
+    assert "Content-Encoding" not in refused_headers
+    assert json.loads(refused_body) == json.loads(identity_body)
+
+
+@pytest.mark.parametrize(
+    "header, accepted",
+    [
+        ("gzip", True),
+        ("deflate, gzip;q=0.5", True),
+        ("GZIP; Q=1.0", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("gzip;q=0.0, *", False),
+        ("*;q=0", False),
+        ("identity", False),
+        ("", False),
+    ],
+)
+def test_accepts_gzip(header, accepted):
+    assert _accepts_gzip(header) is accepted
+
+
+def test_warm_hits_reuse_encoded_bodies(server, monkeypatch):
+    calls = []
+    original = api_server._encode_body
+
+    def counting_encode(body):
+        calls.append(body)
+        return original(body)
+
+    monkeypatch.setattr(api_server, "_encode_body", counting_encode)
+    paths = [
+        "/analysis?symbol=THYAO.IS",
+        "/batch?symbols=THYAO.IS,BTC-USD",
+        "/category?name=" + quote("🪙 Kripto Paralar") + "&limit=2",
+    ]
+    for path in paths:
+        for headers in ({}, {"Accept-Encoding": "gzip"}, {}):
+            assert _get(server, path, headers)[0] == 200
+    assert len(calls) == len(paths)
+
+
+def test_etag_stable_across_cache_rebuilds():
+    cache = AnalysisCache(fake_loader, ttl=300.0)
+    first = cache.get("THYAO.IS", "1y")
+    cache.clear()
+    assert cache.get("THYAO.IS", "1y").etag == first.etag
+
+
+def test_fake_loader_sizes_data_by_period():
+    short, _, _ = fake_loader("THYAO.IS", "1mo")
+    long, _, _ = fake_loader("THYAO.IS", "2y")
+    assert len(short) < len(long)
+
+
+@pytest.mark.parametrize(
+    "path, status",
+    [
+        ("/analysis", 400),
+        ("/analysis?symbol=THYAO.IS&period=5y", 400),
+        ("/batch", 400),
+        ("/category?name=" + quote("🪙 Kripto Paralar") + "&limit=0", 400),
+        ("/category?name=" + quote("🪙 Kripto Paralar") + "&limit=abc", 400),
+        ("/category?name=Yok", 404),
+        ("/nope", 404),
+    ],
+)
+def test_error_paths(server, path, status):
+    code, headers, body = _get(server, path)
+    assert code == status
+    assert headers["Cache-Control"] == "no-store"
+    assert "error" in json.loads(body)
+
+
+def test_missing_data_is_404_and_not_cached_for_full_ttl():
+    cache = AnalysisCache(lambda symbol, period: (None, 0.0, False), ttl=300.0)
+    entry = cache.get("YOK", "1y")
+    assert entry.failed
+    assert cache.max_age(entry) <= 30
+
+    with _serve(lambda symbol, period: (None, 0.0, False)) as srv:
+        status, _, _ = _get(srv, "/analysis?symbol=YOK")
+    assert status == 404
+
+
+def test_cache_is_bounded():
+    cache = AnalysisCache(fake_loader, ttl=300.0, max_entries=3)
+    for symbol in ("A", "B", "C", "D", "E"):
+        cache.get(symbol, "1mo")
+    assert len(cache) == 3
+    assert cache._key_locks == {}
+
+
+def test_concurrent_cold_requests_load_once():
+    calls = []
+    release = threading.Event()
+
+    def slow_loader(symbol, period):
+        calls.append(symbol)
+        release.wait(5)
+        return fake_loader(symbol, period)
+
+    with _serve(slow_loader) as srv:
+        results = []
+        clients = [
+            threading.Thread(target=lambda: results.append(_get(srv, "/analysis?symbol=THYAO.IS")))
+            for _ in range(8)
+        ]
+        for client in clients:
+            client.start()
+        time.sleep(0.3)
+        release.set()
+        for client in clients:
+            client.join(10)
+
+        assert calls == ["THYAO.IS"]
+        assert [status for status, _, _ in results] == [200] * 8
+        assert len({headers["ETag"] for _, headers, _ in results}) == 1
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from api_server import AnalysisCache
+from market_simulator import MarketReplay, Regime, _window, calendar_for, simulate_market
+
+
+@pytest.fixture(scope="module")
+def panel():
+    return simulate_market(days=1500, seed=3)
+
+
+def _mean_pairwise_corr(returns: pd.DataFrame) -> float:
+    corr = returns.corr().values
+    n = len(corr)
+    return (corr.sum() - n) / (n * n - n)
+
+
+def test_same_seed_is_deterministic():
+    first = simulate_market(days=120, seed=11)
+    second = simulate_market(days=120, seed=11)
+    other = simulate_market(days=120, seed=12)
+
+    for symbol, df in first.bars.items():
+        pd.testing.assert_frame_equal(df, second.bars[symbol])
+    pd.testing.assert_series_equal(first.regimes, second.regimes)
+    assert not first.bars["SPY"].equals(other.bars["SPY"])
+
+
+def test_calendars(panel):
+    crypto = panel.bars["BTC-USD"].index
+    bist = panel.bars["THYAO.IS"].index
+    fx = panel.bars["EURUSD=X"].index
+
+    assert (crypto.dayofweek >= 5).any()
+    assert not ((bist.month == 10) & (bist.day == 29)).any()
+    assert (fx.dayofweek < 5).all()
+
+
+def test_calendar_assigned_by_symbol_suffix(panel):
+    assert calendar_for("XU100.IS") == "bist"
+    assert calendar_for("FOO-USD") == "crypto"
+    assert calendar_for("EURUSD=X") == "fx"
+    assert panel.bars["XU100.IS"].index.equals(panel.bars["THYAO.IS"].index)
+
+
+def test_ohlc_invariants(panel):
+    for df in panel.bars.values():
+        assert (df["High"] >= df[["Open", "Close"]].max(axis=1)).all()
+        assert (df["Low"] <= df[["Open", "Close"]].min(axis=1)).all()
+        assert (df["Low"] > 0).all()
+
+
+def test_stress_regime_raises_correlation(panel):
+    symbols = ["SPY", "QQQ", "THYAO.IS", "GARAN.IS", "^GSPC", "GLD", "CL=F", "VTSAX"]
+    closes = pd.DataFrame({s: panel.bars[s]["Close"] for s in symbols}).dropna()
+    returns = np.log(closes).diff().dropna()
+    regime = panel.regimes.reindex(returns.index)
+
+    calm = _mean_pairwise_corr(returns[regime == "Sakin"])
+    stress = _mean_pairwise_corr(returns[regime == "Stres"])
+    assert stress > calm
+
+
+def test_window_respects_until_and_period(panel):
+    df = panel.bars["SPY"]
+    until = df.index[400] + pd.Timedelta(hours=12)
+    window = _window(df, "1mo", until)
+
+    assert window.index[-1] == df.index[400]
+    assert window.index[0] >= df.index[400] - pd.DateOffset(months=1)
+    assert _window(df, "1y", df.index[0] - pd.Timedelta(days=1)).empty
+
+
+def test_replay_loader_follows_cursor(panel):
+    replay = MarketReplay(panel, speed=None)
+    seen = []
+
+    def consumer(symbol, result):
+        df, _, is_demo = result
+        assert is_demo
+        seen.append((df.index[-1], replay.cursor))
+
+    stats = replay.run(consumer, max_steps=5)
+
+    assert stats["steps"] == 5
+    assert seen and all(last == cursor for last, cursor in seen)
+    assert replay.cursor == replay.timeline[4][0]
+
+
+def test_replay_through_api_cache_with_zero_ttl(panel):
+    replay = MarketReplay(panel, speed=None)
+    cache = AnalysisCache(replay.loader, ttl=0)
+
+    replay.run(lambda symbol, result: None, max_steps=1)
+    first = cache.get("BTC-USD", "1y").payload["as_of"]
+    replay.run(lambda symbol, result: None, max_steps=3)
+    assert cache.get("BTC-USD", "1y").payload["as_of"] > first
+
+
+def test_single_regime():
+    panel = simulate_market(days=200, regimes=(Regime("Sakin", 1.0, 0.0, 1.0, 0.9),))
+    assert set(panel.regimes) == {"Sakin"}
+    assert len(panel.bars["SPY"]) > 0
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"symbols": []}, {"days": 0}, {"regimes": ()}],
+)
+def test_invalid_inputs_raise_value_error(kwargs):
+    with pytest.raises(ValueError):
+        simulate_market(**kwargs)